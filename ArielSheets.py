@@ -1,10 +1,19 @@
 import sys
 import json
 import re
+import functools
+import math
+import operator
+import bisect
+import contextlib
+import hashlib
+import types
+import ast
 import numpy as np
 import logging
+import time
 from datetime import datetime
-from sympy import sympify, SympifyError
+from collections import deque
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QTableWidget, 
                             QTableWidgetItem, QVBoxLayout, QWidget, 
                             QMenuBar, QMenu, QFileDialog, QToolBar,
@@ -14,13 +23,15 @@ from PyQt6.QtWidgets import (QApplication, QMainWindow, QTableWidget,
                             QLabel, QDialogButtonBox, QComboBox,
                             QHeaderView, QTabWidget)
 from PyQt6.QtGui import QFont, QKeySequence, QColor, QAction, QShortcut, QIcon
-from PyQt6.QtCore import Qt, QRegularExpression, QSize
-import requests
-import webbrowser
-from packaging import version
+from PyQt6.QtCore import Qt, QRegularExpression, QSize, QTimer, QObject, QThread, pyqtSignal
 import os
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Create logs directory in AppData
 app_data_path = os.path.join(os.getenv('APPDATA'), 'Ariel Sheets')
 logs_path = os.path.join(app_data_path, 'logs')
@@ -33,6 +44,515 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+# Patterns for ranges (A1:B20) and function calls (SUM(...)) inside
+# formulas, compiled once
+_RANGE_RE = re.compile(r'([A-Z]+)(\d+):([A-Z]+)(\d+)', re.ASCII)
+_FUNC_RE = re.compile(r'([A-Z]+)\((.*)\)')
+_NUMERIC_RE = re.compile(r'\s*[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\s*', re.ASCII)
+
+# Formula tokens: a number, a cell reference or an operator/parenthesis
+_TOKEN_RE = re.compile(r'\s*(?:(\d+\.?\d*|\.\d+)|([A-Z]+\d+)|(\*\*|//|[-+*/()]))', re.ASCII)
+
+# Binary operators by symbol: (precedence, function). As in Python, **
+# binds tighter than a prefix sign on its left and groups right to left
+BINARY_OPERATORS = {
+    '+': (1, operator.add),
+    '-': (1, operator.sub),
+    '*': (2, operator.mul),
+    '/': (2, operator.truediv),
+    '//': (2, operator.floordiv),
+    '**': (4, operator.pow)
+}
+UNARY_PRECEDENCE = 3
+RIGHT_ASSOCIATIVE = {'**'}
+
+# RPN instruction kinds, each instruction being a (kind, argument) pair
+_PUSH_CONST, _PUSH_REF, _BINARY, _NEGATE = range(4)
+
+@functools.lru_cache(maxsize=4096)
+def _compile_formula(formula):
+    """Compile formula text (without the leading '=') into RPN.
+
+    Returns (rpn, refs) where rpn is a tuple of instructions for _eval_rpn
+    and refs the cell ids it reads, in argument order. Constant formulas are
+    folded to (value, ()) and formulas with invalid characters return None.
+    Raises SyntaxError on a malformed formula.
+    """
+    rpn = []
+    refs = []
+    ops = []  # Pending operators: (precedence, instruction) or '('
+    expect_operand = True
+    pos = 0
+    end = len(formula.rstrip())
+
+    def pop_while(precedence):
+        while ops and ops[-1] != '(' and ops[-1][0] >= precedence:
+            rpn.append(ops.pop()[1])
+
+    while pos < end:
+        match = _TOKEN_RE.match(formula, pos)
+        if not match:
+            return None
+        pos = match.end()
+        number, ref, symbol = match.groups()
+
+        if number or ref:
+            if not expect_operand:
+                raise SyntaxError("syntax error")
+            if number:
+                rpn.append((_PUSH_CONST, float(number) if '.' in number else int(number)))
+            else:
+                if ref not in refs:
+                    refs.append(ref)
+                rpn.append((_PUSH_REF, refs.index(ref)))
+            expect_operand = False
+        elif symbol == '(':
+            if not expect_operand:
+                raise SyntaxError("syntax error")
+            ops.append('(')
+        elif symbol == ')':
+            if expect_operand:
+                raise SyntaxError("syntax error")
+            pop_while(0)
+            if not ops:
+                raise SyntaxError("unbalanced parentheses")
+            ops.pop()
+        elif expect_operand:
+            # Prefix sign, which binds tighter than any binary operator
+            if symbol == '-':
+                ops.append((UNARY_PRECEDENCE, (_NEGATE, None)))
+            elif symbol != '+':
+                raise SyntaxError("syntax error")
+        else:
+            precedence, func = BINARY_OPERATORS[symbol]
+            pop_while(precedence + 1 if symbol in RIGHT_ASSOCIATIVE else precedence)
+            ops.append((precedence, (_BINARY, func)))
+            expect_operand = True
+
+    if expect_operand:
+        raise SyntaxError("syntax error")
+    while ops:
+        op = ops.pop()
+        if op == '(':
+            raise SyntaxError("unbalanced parentheses")
+        rpn.append(op[1])
+
+    rpn = tuple(rpn)
+    if not refs:
+        return _eval_rpn(rpn, ()), ()
+    return rpn, tuple(refs)
+
+def _eval_rpn(rpn, values):
+    """Run compiled RPN, reading cell references from values by position"""
+    stack = []
+    push = stack.append
+    for kind, arg in rpn:
+        if kind == _PUSH_CONST:
+            push(arg)
+        elif kind == _PUSH_REF:
+            push(values[arg])
+        elif kind == _BINARY:
+            right = stack.pop()
+            stack[-1] = arg(stack[-1], right)
+        else:
+            stack[-1] = -stack[-1]
+    return stack[0]
+
+def _native_compile(source, nargs):
+    """Compile a hot formula's function source to machine code.
+
+    The source is built from the RPN exactly as written, so it computes the
+    same operations in the same order as _eval_rpn. It is compiled with
+    numba when available.
+    """
+    func = _formula_function(source)
+    if ' ** ' in source:
+        # numba returns inf or nan where Python's ** raises or gives a
+        # complex number, so powers stay in Python
+        return func
+    try:
+        return _jit_compile(source, nargs)
+    except Exception as e:
+        # numba missing or formula unsupported, keep using the Python version
+        logging.info(f"Formula JIT unavailable for {source!r}: {str(e)}")
+        return func
+
+# Operator AST nodes by RPN function, and every node a formula function may contain
+_AST_OPERATORS = {
+    operator.add: ast.Add,
+    operator.sub: ast.Sub,
+    operator.mul: ast.Mult,
+    operator.truediv: ast.Div,
+    operator.floordiv: ast.FloorDiv,
+    operator.pow: ast.Pow
+}
+_FORMULA_NODES = (ast.Module, ast.FunctionDef, ast.arguments, ast.arg, ast.Return,
+                  ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Load,
+                  ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Pow, ast.USub)
+
+@functools.lru_cache(maxsize=4096)
+def _formula_source(rpn, nargs):
+    """Return the source of a function formula(a0, a1, ...) computing compiled RPN"""
+    args = [f"a{i}" for i in range(nargs)]
+    stack = []
+    for kind, arg in rpn:
+        if kind == _PUSH_CONST:
+            stack.append(ast.Constant(arg))
+        elif kind == _PUSH_REF:
+            stack.append(ast.Name(args[arg], ast.Load()))
+        elif kind == _BINARY:
+            right = stack.pop()
+            stack[-1] = ast.BinOp(stack[-1], _AST_OPERATORS[arg](), right)
+        else:
+            stack[-1] = ast.UnaryOp(ast.USub(), stack[-1])
+    return f"def formula({', '.join(args)}):\n    return {ast.unparse(stack[0])}\n"
+
+def _formula_function(source):
+    """Compile formula source after checking it only does arithmetic on its arguments"""
+    tree = ast.parse(source)
+    for node in ast.walk(tree):
+        if not isinstance(node, _FORMULA_NODES):
+            raise ValueError(f"Unexpected {type(node).__name__} in formula")
+    namespace = {'__builtins__': {}}
+    exec(compile(tree, '<formula>', 'exec'), namespace)
+    return namespace['formula']
+
+def _col_label(col):
+    """Convert a zero-based column index into letters (A, Z, AA, ...)"""
+    label = ''
+    col += 1
+    while col:
+        col, remainder = divmod(col - 1, 26)
+        label = chr(65 + remainder) + label
+    return label
+
+# Header labels shared by every sheet, extended when a larger sheet needs more
+_COL_LABELS = []
+_ROW_LABELS = []
+
+def _header_labels(labels, count, make_label):
+    """Return the first count header labels, making any not built yet"""
+    labels.extend(make_label(i) for i in range(len(labels), count))
+    return labels[:count]
+
+def _row_label(row):
+    return str(row + 1)
+
+@functools.lru_cache(maxsize=None)
+def _cell_id(row, col):
+    """Return the id (e.g. B3) of a zero-based cell position"""
+    return f"{_col_label(col)}{row + 1}"
+
+def _col_to_index(letters):
+    """Convert column letters (A, Z, AA, ...) into a zero-based index"""
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - 64
+    return index - 1
+
+def _parse_ref(ref):
+    """Convert a cell id like AB12 into a zero-based (row, col) tuple"""
+    i = 0
+    while i < len(ref) and 'A' <= ref[i] <= 'Z':
+        i += 1
+    digits = ref[i:]
+    if not i or not digits.isdigit() or not int(digits):
+        raise ValueError(f"Invalid cell id: {ref}")
+    return int(digits) - 1, _col_to_index(ref[:i])
+
+def _formula_precedents(formula):
+    """Return what a formula (without '=') reads, as (cells, ranges).
+
+    cells holds the (row, col) of each single-cell reference. A range
+    function reads a (top, left, bottom, right) rectangle instead, which is
+    kept as is rather than expanded into every cell it covers.
+    """
+    function_match = _FUNC_RE.fullmatch(formula)
+    if function_match and function_match.group(1) in RANGE_FUNCTIONS:
+        spec = _range_formula('=' + formula)
+        return set(), (spec[1:],) if spec else ()
+
+    try:
+        compiled = _compile_formula(formula)
+    except Exception:
+        return set(), ()
+    if compiled is None:
+        return set(), ()
+
+    # A reference to row 0 can't be read, so the formula shows an error
+    # whatever its other cells hold and doesn't need to depend on them
+    cells = set()
+    for ref in compiled[1]:
+        with contextlib.suppress(ValueError):
+            cells.add(_parse_ref(ref))
+    return cells, ()
+
+# Use orjson's C encoder for workbooks when it is installed
+if orjson is not None:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    _json_loads = json.loads
+
+# Bits of the font flags stored with each saved cell
+FONT_BOLD = 1
+FONT_ITALIC = 2
+
+def _is_numeric(text):
+    """Check whether text is a plain decimal number, without raising"""
+    return _NUMERIC_RE.fullmatch(text) is not None
+
+@functools.lru_cache(maxsize=1024)
+def _try_float(text):
+    """Parse text as a float, returning None instead of raising"""
+    return float(text) if _is_numeric(text) else None
+
+@functools.lru_cache(maxsize=256)
+def _parse_bound(text):
+    """Parse a Custom Range bound: None when blank, NaN when unparsable"""
+    if not text:
+        return None
+    bound = _try_float(text)
+    return float('nan') if bound is None else bound
+
+def _validation_bounds(validation):
+    """Return the parsed (min, max) of a Custom Range validation.
+
+    A blank bound is None (unbounded); an unparsable one is NaN so that no
+    value satisfies it. Parsed bounds are cached by their text rather than
+    stored on the validation, which is saved with the workbook.
+    """
+    return _parse_bound(validation.get('min')), _parse_bound(validation.get('max'))
+
+def _sequential_sum(values):
+    """Sum the numbers in values one at a time in row-major order.
+
+    np.nansum adds pairwise, which can round differently from the range
+    kernel's running total. cumsum adds in the same order as the kernel.
+    """
+    numbers = values[~np.isnan(values)]
+    # Adding 0.0 turns a -0.0 total into 0.0, as the kernel's does
+    return np.cumsum(numbers)[-1] + 0.0 if numbers.size else 0.0
+
+def _sequential_mean(values):
+    return _sequential_sum(values) / np.count_nonzero(~np.isnan(values))
+
+# Vectorized reducers for the range functions, applied to a slice of a
+# sheet's numeric shadow where blank and text cells are NaN. They give the
+# same results as the range kernel used for batched recalculation
+RANGE_FUNCTIONS = {
+    'SUM': _sequential_sum,
+    'AVERAGE': _sequential_mean,
+    'MIN': np.nanmin,
+    'MAX': np.nanmax,
+    'COUNT': lambda values: np.count_nonzero(~np.isnan(values) & (values != 0))
+}
+
+# Range functions by kernel opcode, for batched recalculation
+RANGE_OPCODES = {'SUM': 0, 'AVERAGE': 1, 'MIN': 2, 'MAX': 3, 'COUNT': 4}
+RANGE_BATCH_MIN = 16  # Smallest batch worth a kernel call
+
+def _range_result(opcode, value):
+    """Format a range kernel result as cell text"""
+    if opcode == RANGE_OPCODES['COUNT']:
+        return str(int(value))
+    if math.isnan(value):
+        return "ERROR: Invalid AVERAGE range"
+    return str(value)
+
+@functools.lru_cache(maxsize=4096)
+def _range_formula(formula):
+    """Parse a range-function formula into (opcode, top, left, bottom, right), or None"""
+    function_match = _FUNC_RE.fullmatch(formula[1:])
+    if not function_match or function_match.group(1) not in RANGE_OPCODES:
+        return None
+    range_match = _RANGE_RE.fullmatch(function_match.group(2))
+    if not range_match:
+        return None
+    start_col, start_row, end_col, end_row = range_match.groups()
+    start_row, end_row = int(start_row) - 1, int(end_row) - 1
+    if min(start_row, end_row) < 0:
+        return None
+    start_col, end_col = _col_to_index(start_col), _col_to_index(end_col)
+    return (RANGE_OPCODES[function_match.group(1)],
+            min(start_row, end_row), min(start_col, end_col),
+            max(start_row, end_row), max(start_col, end_col))
+
+def _reduce_ranges(values, opcodes, tops, lefts, bottoms, rights, out):
+    """Reduce many ranges of a value matrix at once, skipping NaN cells"""
+    for k in range(opcodes.shape[0]):
+        total = 0.0
+        count = 0
+        nonzero = 0
+        low = math.inf
+        high = -math.inf
+        for row in range(tops[k], bottoms[k] + 1):
+            for col in range(lefts[k], rights[k] + 1):
+                value = values[row, col]
+                if value == value:
+                    total += value
+                    count += 1
+                    if value != 0.0:
+                        nonzero += 1
+                    low = min(low, value)
+                    high = max(high, value)
+
+        opcode = opcodes[k]
+        if opcode == 0:
+            out[k] = total
+        elif opcode == 1:
+            out[k] = total / count if count else math.nan
+        elif opcode == 2:
+            out[k] = low if count else 0.0
+        elif opcode == 3:
+            out[k] = high if count else 0.0
+        else:
+            out[k] = nonzero
+
+_compiled_reduce_ranges = None
+
+def _range_kernel():
+    """Return _reduce_ranges compiled with numba, or None if it can't be compiled"""
+    global _compiled_reduce_ranges
+    if _compiled_reduce_ranges is None:
+        try:
+            import numba
+            kernel = numba.njit(cache=True)(_reduce_ranges)
+            # numba compiles on the first call, so make that call here where
+            # a failure can fall back to the numpy reducers
+            index = np.zeros(1, dtype=np.int64)
+            kernel(np.zeros((1, 1)), index, index, index, index, index, np.empty(1))
+            _compiled_reduce_ranges = kernel
+        except Exception as e:
+            logging.info(f"Range kernel unavailable: {str(e)}")
+            _compiled_reduce_ranges = False
+    return _compiled_reduce_ranges or None
+
+# Clipboard record per cell: text, background and foreground RGBA (0 when
+# the cell has no brush) and an index into _FONT_POOL (-1 when no item)
+CLIPBOARD_DTYPE = np.dtype([('text', 'O'), ('bg_rgba', 'u4'),
+                            ('fg_rgba', 'u4'), ('font_id', 'i4')])
+
+# Every distinct font copied so far, so repeated fonts are stored once
+_FONT_POOL = []
+_font_key_to_id = {}
+
+def _intern_font(font):
+    """Return the _FONT_POOL index of font, adding it if it's new"""
+    key = (font.family(), font.pointSize(), font.weight(), font.italic(), font.underline())
+    font_id = _font_key_to_id.get(key)
+    if font_id is None:
+        font_id = _font_key_to_id[key] = len(_FONT_POOL)
+        _FONT_POOL.append(QFont(font))
+    return font_id
+
+def _brush_rgba(brush):
+    """Return a brush's color as RGBA, or 0 for an empty brush"""
+    if brush.style() == Qt.BrushStyle.NoBrush:
+        return 0
+    return brush.color().rgba()
+
+_color_hex_cache = {}  # RGBA -> "#rrggbb"
+_rgba_color_cache = {}  # RGBA -> QColor
+
+def _color_hex(color):
+    """Return a QColor's hex name, converting each distinct color only once"""
+    rgba = color.rgba()
+    name = _color_hex_cache.get(rgba)
+    if name is None:
+        name = _color_hex_cache[rgba] = color.name()
+    return name
+
+def _rgba_color(rgba):
+    """Return a shared QColor for an RGBA value, constructing each only once"""
+    color = _rgba_color_cache.get(rgba)
+    if color is None:
+        color = _rgba_color_cache[rgba] = QColor.fromRgba(rgba)
+    return color
+
+# Formulas evaluated this many times get compiled to native code
+JIT_THRESHOLD = 3
+# Python's message for a division by zero depends on the operand types and
+# compiled formulas raise their own, so every path reports this one
+DIVISION_ERROR = "ERROR: Invalid formula (division by zero)"
+formula_cache_path = os.path.join(app_data_path, 'formula_cache')
+_hot_formulas = {}  # formula source -> [call count, compiled callable or None]
+
+# Every compiled formula function is defined in this one module. numba
+# imports it by name when loading a formula from its on-disk cache
+_formula_module = types.ModuleType('ariel_formulas')
+
+def _jit_compile(source, nargs):
+    """Compile a formula function's source with numba, caching the result on disk"""
+    import numba
+
+    # numba can only cache functions whose source lives in a real file, so
+    # write the source out before compiling
+    os.makedirs(formula_cache_path, exist_ok=True)
+    name = 'formula_' + hashlib.sha1(source.encode()).hexdigest()
+    path = os.path.join(formula_cache_path, name + '.py')
+    try:
+        with open(path) as f:
+            current = f.read() == source
+    except OSError:
+        current = False
+    if not current:
+        with open(path, 'w') as f:
+            f.write(source)
+
+    sys.modules.setdefault(_formula_module.__name__, _formula_module)
+    exec(compile(source, path, 'exec'), _formula_module.__dict__)
+    return numba.njit((numba.float64,) * nargs, cache=True)(_formula_module.formula)
+
+def _formula_callable(rpn, nargs):
+    """Return a compiled callable for hot formula RPN, or None to interpret it.
+
+    Formulas are counted and compiled by their generated source, so cells
+    with the same shape, like =A1*Z1 and =A2*Z1, share one compile.
+    """
+    source = _formula_source(rpn, nargs)
+    entry = _hot_formulas.setdefault(source, [0, None])
+    if entry[1] is not None:
+        return entry[1]
+
+    entry[0] += 1
+    if entry[0] < JIT_THRESHOLD:
+        return None
+
+    try:
+        entry[1] = _native_compile(source, nargs)
+    except Exception as e:
+        # No compiler available, keep interpreting the RPN
+        logging.info(f"Formula compilation unavailable for {source!r}: {str(e)}")
+        entry[1] = lambda *values: _eval_rpn(rpn, values)
+    return entry[1]
+
+@contextlib.contextmanager
+def bulk_update(sheet):
+    """Suspend repaints and signals on a sheet while changing many items"""
+    sheet.setUpdatesEnabled(False)
+    sheet.blockSignals(True)
+    try:
+        yield sheet
+    finally:
+        sheet.blockSignals(False)
+        sheet.setUpdatesEnabled(True)
+        sheet.viewport().update()
+
+@contextlib.contextmanager
+def suspend_cell_signals(sheet, handler):
+    """Disconnect a handler from a sheet's itemChanged signal while writing cells.
+
+    Unlike bulk_update, the sheet's own item tracking keeps running.
+    """
+    sheet.itemChanged.disconnect(handler)
+    try:
+        yield sheet
+    finally:
+        sheet.itemChanged.connect(handler)
+
 class TableDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -80,17 +600,234 @@ class Sheet(QTableWidget):
         super().__init__(rows, cols, parent)
         self.cell_validations = {}  # Initialize validations dict
         self.tables = []  # Initialize tables list
+        self._populated = set()  # (row, col) of every cell holding an item
+        self._rows = []  # Sorted rows holding items
+        self._row_cols = {}  # row -> sorted columns holding items
+        self.used_max_row = -1  # Bounding box of every cell ever given an item
+        self.used_max_col = -1
+        self.numbers = np.full((rows, cols), np.nan)  # Cell values, NaN unless numeric
+
+        # Formula dependency graph, keyed by (row, col)
+        self.formulas = {}  # formula cell -> formula text
+        self.precedents = {}  # formula cell -> cells it reads
+        self.range_precedents = {}  # formula cell -> (top, left, bottom, right) ranges it reads
+        self.range_columns = {}  # column -> formula cells with a range spanning it
+        self.dependents = {}  # cell -> formula cells reading it
+        self.value_cache = {}  # formula cell -> last result
         self.setup_sheet()
         
+        # Items created by editing an empty cell never go through setItem
+        self.itemChanged.connect(self.track_item)
+        
     def setup_sheet(self):
         # Set headers
-        headers = [chr(65 + i) for i in range(self.columnCount())]
-        self.setHorizontalHeaderLabels(headers)
-        self.setVerticalHeaderLabels([str(i+1) for i in range(self.rowCount())])
+        self.setHorizontalHeaderLabels(_header_labels(_COL_LABELS, self.columnCount(), _col_label))
+        self.setVerticalHeaderLabels(_header_labels(_ROW_LABELS, self.rowCount(), _row_label))
         
         # Enable selection and copying
         self.setSelectionMode(QTableWidget.SelectionMode.ContiguousSelection)
 
+    def setItem(self, row, col, item):
+        # A new item replaces any formula in the cell
+        if (row, col) in self.formulas:
+            self.clear_formula((row, col))
+        super().setItem(row, col, item)
+        if not (0 <= row < self.rowCount() and 0 <= col < self.columnCount()):
+            # Qt ignores items placed outside the grid
+            return
+        if item is None:
+            self.remove_populated(row, col)
+        else:
+            self.add_populated(row, col)
+        self.store_number(row, col, item.text() if item is not None else "")
+
+    def takeItem(self, row, col):
+        self.remove_populated(row, col)
+        self.store_number(row, col, "")
+        self.clear_formula((row, col))
+        return super().takeItem(row, col)
+
+    def clear(self):
+        super().clear()
+        self._populated.clear()
+        self._rows.clear()
+        self._row_cols.clear()
+        self.used_max_row = self.used_max_col = -1
+        self.numbers.fill(np.nan)
+        self.clear_formulas()
+
+    def clearContents(self):
+        super().clearContents()
+        self._populated.clear()
+        self._rows.clear()
+        self._row_cols.clear()
+        self.used_max_row = self.used_max_col = -1
+        self.numbers.fill(np.nan)
+        self.clear_formulas()
+
+    def track_item(self, item):
+        row, col = item.row(), item.column()
+        self.add_populated(row, col)
+        self.store_number(row, col, item.text())
+
+    def add_populated(self, row, col):
+        """Record that a cell holds an item"""
+        if (row, col) in self._populated:
+            return
+        self._populated.add((row, col))
+        self.mark_used(row, col)
+        cols = self._row_cols.get(row)
+        if cols is None:
+            self._row_cols[row] = [col]
+            bisect.insort(self._rows, row)
+        else:
+            bisect.insort(cols, col)
+
+    def remove_populated(self, row, col):
+        """Record that a cell no longer holds an item"""
+        if (row, col) not in self._populated:
+            return
+        self._populated.discard((row, col))
+        cols = self._row_cols[row]
+        del cols[bisect.bisect_left(cols, col)]
+        if not cols:
+            del self._row_cols[row]
+            del self._rows[bisect.bisect_left(self._rows, row)]
+
+    def store_number(self, row, col, text):
+        """Mirror a cell's text into the numeric shadow"""
+        numbers = self.numbers
+        if row >= numbers.shape[0] or col >= numbers.shape[1]:
+            # The sheet has grown since the shadow was sized
+            grow_rows = max(row + 1, self.rowCount()) - numbers.shape[0]
+            grow_cols = max(col + 1, self.columnCount()) - numbers.shape[1]
+            numbers = self.numbers = np.pad(numbers, ((0, max(grow_rows, 0)), (0, max(grow_cols, 0))),
+                                            constant_values=np.nan)
+        value = _try_float(text)
+        numbers[row, col] = np.nan if value is None else value
+
+    def mark_used(self, row, col):
+        """Grow the used range to cover a cell"""
+        if row > self.used_max_row:
+            self.used_max_row = row
+        if col > self.used_max_col:
+            self.used_max_col = col
+
+    def populated_cells(self):
+        """Return the (row, col) of every cell holding an item, in row order"""
+        return [(row, col) for row in self._rows for col in self._row_cols[row]]
+
+    def populated_count(self):
+        return len(self._populated)
+
+    def populated_in_range(self, top, left, bottom, right):
+        """Yield the (row, col) of every cell holding an item inside a rectangle"""
+        rows = self._rows
+        for row in rows[bisect.bisect_left(rows, top):bisect.bisect_right(rows, bottom)]:
+            cols = self._row_cols[row]
+            for col in cols[bisect.bisect_left(cols, left):bisect.bisect_right(cols, right)]:
+                yield row, col
+
+    def set_formula(self, cell, formula, precedents, ranges=()):
+        """Record a cell's formula and the cells and ranges it reads"""
+        self.clear_formula(cell)
+        self.formulas[cell] = formula
+        self.precedents[cell] = precedents
+        for precedent in precedents:
+            self.dependents.setdefault(precedent, set()).add(cell)
+        if ranges:
+            self.range_precedents[cell] = ranges
+            for col in self._range_columns_of(ranges):
+                self.range_columns.setdefault(col, set()).add(cell)
+
+    def clear_formula(self, cell):
+        """Forget a cell's formula and unlink it from its precedents"""
+        self.formulas.pop(cell, None)
+        self.value_cache.pop(cell, None)
+        for col in self._range_columns_of(self.range_precedents.pop(cell, ())):
+            readers = self.range_columns[col]
+            readers.discard(cell)
+            if not readers:
+                del self.range_columns[col]
+        for precedent in self.precedents.pop(cell, ()):
+            dependents = self.dependents[precedent]
+            dependents.discard(cell)
+            if not dependents:
+                del self.dependents[precedent]
+
+    def _range_columns_of(self, ranges):
+        """Return the columns of the grid that ranges span"""
+        last_col = self.columnCount() - 1
+        return {col for _, left, _, right in ranges for col in range(left, min(right, last_col) + 1)}
+
+    def clear_formulas(self):
+        self.formulas.clear()
+        self.precedents.clear()
+        self.range_precedents.clear()
+        self.range_columns.clear()
+        self.dependents.clear()
+        self.value_cache.clear()
+
+    def readers(self, cell):
+        """Return the formula cells that read cell directly or through a range"""
+        row, col = cell
+        readers = set(self.dependents.get(cell, ()))
+        # Only the range formulas spanning the cell's column can contain it
+        for formula_cell in self.range_columns.get(col, ()):
+            for top, left, bottom, right in self.range_precedents[formula_cell]:
+                if top <= row <= bottom and left <= col <= right:
+                    readers.add(formula_cell)
+                    break
+        return readers
+
+    def recalc_order(self, cells):
+        """Return the formulas affected by a change to cells, in evaluation order.
+
+        cells is a single (row, col) or an iterable of them. Returns (levels,
+        cyclic). Each level only depends on earlier ones, so its formulas can
+        be evaluated together. cyclic holds the affected formulas that can't
+        be ordered because they sit on or behind a reference cycle.
+        """
+        if isinstance(cells, tuple):
+            cells = (cells,)
+
+        # Collect every formula downstream of the changed cells
+        affected = set()
+        seen = set()
+        readers = {}
+        queue = deque(cells)
+        while queue:
+            current = queue.popleft()
+            if current in seen:
+                continue
+            seen.add(current)
+            if current in self.formulas:
+                affected.add(current)
+            readers[current] = self.readers(current)
+            queue.extend(readers[current])
+
+        # Kahn's algorithm over the affected subgraph, one level at a time
+        indegree = dict.fromkeys(affected, 0)
+        for current in affected:
+            for dependent in readers[current]:
+                indegree[dependent] += 1
+        level = [c for c, degree in indegree.items() if not degree]
+        levels = []
+        ordered = 0
+        while level:
+            levels.append(level)
+            ordered += len(level)
+            next_level = []
+            for current in level:
+                for dependent in readers[current]:
+                    indegree[dependent] -= 1
+                    if not indegree[dependent]:
+                        next_level.append(dependent)
+            level = next_level
+
+        cyclic = {c for c, degree in indegree.items() if degree} if ordered < len(affected) else set()
+        return levels, cyclic
+
 class ExcelClone(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -99,13 +836,18 @@ class ExcelClone(QMainWindow):
         self.setWindowIcon(QIcon("icon.ico"))
         
         # Apply stylesheet
-        self.setStyleSheet(Style.get_stylesheet())
+        self.setStyleSheet(STYLESHEET)
         
         # Initialize variables
         self.clipboard = None
         self.sort_order = Qt.SortOrder.AscendingOrder
         self.cell_validations = {}
         self.current_file_path = None
+        self._sheet_names = set()  # Names of all open sheets
+        self._dirty = False  # Whether the workbook changed since it was saved or opened
+        self._loading = False
+        self._update_thread = None  # Running update check, if any
+        self._update_worker = None
         
         # Update table styles with new theme colors
         self.table_styles = {
@@ -143,6 +885,7 @@ class ExcelClone(QMainWindow):
         
         # Add first sheet
         self.add_sheet()
+        self._dirty = False
         
         # Create menu bar and toolbars
         self.create_menu()
@@ -152,14 +895,16 @@ class ExcelClone(QMainWindow):
         self.formula_bar.returnPressed.connect(self.formula_entered)
         self.tab_widget.currentChanged.connect(self.sheet_changed)
         
-        # Check for updates on startup
-        self.check_updates()
+        # Check for updates once the window is up, so startup never waits on it
+        QTimer.singleShot(0, self.check_updates)
+        QApplication.instance().aboutToQuit.connect(self.wait_for_update_check)
 
     def add_sheet(self):
         """Add a new sheet to the workbook"""
         sheet_count = self.tab_widget.count()
         new_sheet = Sheet()
         new_sheet.itemChanged.connect(self.cell_changed)
+        new_sheet.itemChanged.connect(self._on_item_changed)
         new_sheet.cell_validations = {}  # Initialize validations for the new sheet
         
         # Get sheet name from user
@@ -173,13 +918,14 @@ class ExcelClone(QMainWindow):
                 return
             
             # Check if name is unique
-            if not any(name == self.tab_widget.tabText(i) 
-                      for i in range(self.tab_widget.count())):
+            if name not in self._sheet_names:
                 break
             QMessageBox.warning(self, 'Error', 'Sheet name must be unique')
         
         self.tab_widget.addTab(new_sheet, name)
+        self._sheet_names.add(name)
         self.tab_widget.setCurrentWidget(new_sheet)
+        self._dirty = True
 
     def close_sheet(self, index):
         """Close a sheet tab"""
@@ -188,7 +934,9 @@ class ExcelClone(QMainWindow):
                               'Cannot close last sheet')
             return
         
+        self._sheet_names.discard(self.tab_widget.tabText(index))
         self.tab_widget.removeTab(index)
+        self._dirty = True
 
     def rename_sheet(self):
         """Rename the current sheet"""
@@ -205,12 +953,18 @@ class ExcelClone(QMainWindow):
                 return
                 
             # Check if name is unique
-            if not any(name == self.tab_widget.tabText(i) 
-                      for i in range(self.tab_widget.count())):
+            if name not in self._sheet_names:
                 break
             QMessageBox.warning(self, 'Error', 'Sheet name must be unique')
         
+        self._sheet_names.discard(current_name)
+        self._sheet_names.add(name)
         self.tab_widget.setTabText(current_index, name)
+        self._dirty = True
+
+    def _on_item_changed(self, item):
+        if not self._loading:
+            self._dirty = True
 
     def sheet_changed(self, index):
         """Handle sheet tab changes"""
@@ -218,7 +972,7 @@ class ExcelClone(QMainWindow):
             current_sheet = self.tab_widget.widget(index)
             current_item = current_sheet.currentItem()
             if current_item:
-                self.formula_bar.setText(current_item.text())
+                self.update_formula_bar(current_item, None)
             else:
                 self.formula_bar.clear()
 
@@ -293,7 +1047,7 @@ class ExcelClone(QMainWindow):
         help_menu = menubar.addMenu("Help")
         
         check_update_action = QAction("Check for Updates", self)
-        check_update_action.triggered.connect(self.check_updates)
+        check_update_action.triggered.connect(lambda: self.check_updates(force=True))
         help_menu.addAction(check_update_action)
 
         # Sheet menu
@@ -359,82 +1113,124 @@ class ExcelClone(QMainWindow):
 
     def change_font(self, font):
         if self.current_sheet:
-            for item in self.current_sheet.selectedItems():
-                item.setFont(font)
+            with bulk_update(self.current_sheet) as sheet:
+                for item in sheet.selectedItems():
+                    item.setFont(font)
+            self._dirty = True
 
     def change_font_size(self, size):
         if self.current_sheet:
-            for item in self.current_sheet.selectedItems():
-                font = item.font()
-                font.setPointSize(size)
-                item.setFont(font)
+            with bulk_update(self.current_sheet) as sheet:
+                for item in sheet.selectedItems():
+                    font = item.font()
+                    font.setPointSize(size)
+                    item.setFont(font)
+            self._dirty = True
 
     def format_bold(self):
         if self.current_sheet:
-            for item in self.current_sheet.selectedItems():
-                font = item.font()
-                font.setBold(not font.bold())
-                item.setFont(font)
+            with bulk_update(self.current_sheet) as sheet:
+                for item in sheet.selectedItems():
+                    font = item.font()
+                    font.setBold(not font.bold())
+                    item.setFont(font)
+            self._dirty = True
 
     def format_italic(self):
         if self.current_sheet:
-            for item in self.current_sheet.selectedItems():
-                font = item.font()
-                font.setItalic(not font.italic())
-                item.setFont(font)
+            with bulk_update(self.current_sheet) as sheet:
+                for item in sheet.selectedItems():
+                    font = item.font()
+                    font.setItalic(not font.italic())
+                    item.setFont(font)
+            self._dirty = True
 
     def change_cell_color(self):
         if self.current_sheet:
             color = QColorDialog.getColor()
             if color.isValid():
-                for item in self.current_sheet.selectedItems():
-                    item.setBackground(color)
+                with bulk_update(self.current_sheet) as sheet:
+                    for item in sheet.selectedItems():
+                        item.setBackground(color)
+                self._dirty = True
 
     def copy_cells(self):
-        self.clipboard = []
-        for item in self.spreadsheet.selectedItems():
-            self.clipboard.append({
-                'row': item.row(),
-                'col': item.column(),
-                'text': item.text(),
-                'font': item.font(),
-                'background': item.background()
-            })
+        sheet = self.current_sheet
+        ranges = sheet.selectedRanges()
+        if not ranges:
+            return
+
+        # Store the selection as one record per cell of its bounding rectangle
+        selection = ranges[0]
+        shape = (selection.rowCount(), selection.columnCount())
+        origin = (selection.topRow(), selection.leftColumn())
+        data = np.zeros(shape, dtype=CLIPBOARD_DTYPE)
+        data['text'] = ""
+        data['font_id'] = -1
+
+        for item in sheet.selectedItems():
+            data[item.row() - origin[0], item.column() - origin[1]] = (
+                item.text(),
+                _brush_rgba(item.background()),
+                _brush_rgba(item.foreground()),
+                _intern_font(item.font())
+            )
+
+        self.clipboard = {
+            'shape': shape,
+            'data': data,
+            'origin': origin
+        }
 
     def paste_cells(self):
         if not self.clipboard:
             return
             
-        selected_items = self.spreadsheet.selectedItems()
-        if not selected_items:
-            current_row = self.spreadsheet.currentRow()
-            current_col = self.spreadsheet.currentColumn()
-            if current_row < 0 or current_col < 0:
+        sheet = self.current_sheet
+        ranges = sheet.selectedRanges()
+        if not ranges:
+            base_row = sheet.currentRow()
+            base_col = sheet.currentColumn()
+            if base_row < 0 or base_col < 0:
                 return
-            base_row = current_row
-            base_col = current_col
         else:
-            top_left = selected_items[0]
-            base_row = top_left.row()
-            base_col = top_left.column()
-
-        for cell in self.clipboard:
-            row_offset = cell['row'] - self.clipboard[0]['row']
-            col_offset = cell['col'] - self.clipboard[0]['col']
-            new_row = base_row + row_offset
-            new_col = base_col + col_offset
-            
-            if (new_row >= 0 and new_row < self.spreadsheet.rowCount() and 
-                new_col >= 0 and new_col < self.spreadsheet.columnCount()):
-                new_item = QTableWidgetItem(cell['text'])
-                new_item.setFont(cell['font'])
-                new_item.setBackground(cell['background'])
-                self.spreadsheet.setItem(new_row, new_col, new_item)
+            base_row = ranges[0].topRow()
+            base_col = ranges[0].leftColumn()
+
+        data = self.clipboard['data']
+
+        # Clip the clipboard block to the sheet
+        height = min(data.shape[0], sheet.rowCount() - base_row)
+        width = min(data.shape[1], sheet.columnCount() - base_col)
+        block = data[:height, :width]
+
+        pasted = []
+        with bulk_update(sheet):
+            for row, col in np.argwhere(block['font_id'] >= 0).tolist():
+                text, bg_rgba, fg_rgba, font_id = block[row, col]
+                new_item = QTableWidgetItem(text)
+                new_item.setFont(_FONT_POOL[font_id])
+                if bg_rgba:
+                    new_item.setBackground(_rgba_color(int(bg_rgba)))
+                if fg_rgba:
+                    new_item.setForeground(_rgba_color(int(fg_rgba)))
+                sheet.setItem(base_row + row, base_col + col, new_item)
+                pasted.append((base_row + row, base_col + col))
+        self._dirty = True
+        self.recalculate(sheet, pasted)
 
     def cut_cells(self):
         self.copy_cells()
-        for item in self.spreadsheet.selectedItems():
-            item.setText("")
+        sheet = self.current_sheet
+        cleared = []
+        with suspend_cell_signals(sheet, self.cell_changed):
+            for item in sheet.selectedItems():
+                cell = (item.row(), item.column())
+                sheet.clear_formula(cell)
+                item.setText("")
+                cleared.append(cell)
+        self.recalculate(sheet, cleared)
+
     def insert_table(self):
         dialog = TableDialog(self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
@@ -452,27 +1248,21 @@ class ExcelClone(QMainWindow):
             self.create_table(start_row, start_col, rows, cols, style)
 
     def create_table(self, start_row, start_col, rows, cols, style):
-        style_dict = self.table_styles[style]
-        
-        # Create header row
-        for col in range(cols):
-            header_item = QTableWidgetItem(f"Header {col + 1}")
-            header_item.setBackground(style_dict["header"])
-            header_item.setForeground(QColor("white") if style == "Professional" else QColor("black"))
-            font = header_item.font()
-            font.setBold(True)
-            header_item.setFont(font)
-            self.current_sheet.setItem(start_row, start_col + col, header_item)
-
-        # Create data cells
-        for row in range(rows - 1):
-            for col in range(cols):
-                item = QTableWidgetItem(f"Data")
-                if style == "Striped":
-                    item.setBackground(style_dict["cells"][row % 2])
-                else:
-                    item.setBackground(style_dict["cells"])
-                self.current_sheet.setItem(start_row + row + 1, start_col + col, item)
+        create = {
+            "Simple": self._create_simple,
+            "Striped": self._create_striped,
+            "Professional": self._create_professional
+        }[style]
+        sheet = self.current_sheet
+        # Keep the table inside the grid, so its stored size matches its cells
+        rows = min(rows, sheet.rowCount() - start_row)
+        cols = min(cols, sheet.columnCount() - start_col)
+
+        with bulk_update(sheet):
+            create(sheet, start_row, start_col, rows, cols, self.table_styles[style])
+        self._dirty = True
+        self.recalculate(sheet, [(row, col) for row in range(start_row, start_row + rows)
+                                 for col in range(start_col, start_col + cols)])
 
         # Store table information
         if not hasattr(self.current_sheet, 'tables'):
@@ -485,6 +1275,61 @@ class ExcelClone(QMainWindow):
             'cols': cols
         })
 
+    @staticmethod
+    def _table_template(text, background, foreground=None, bold=False):
+        """Build a formatted item to clone into each cell of a table"""
+        template = QTableWidgetItem(text)
+        template.setBackground(background)
+        if foreground is not None:
+            template.setForeground(foreground)
+        if bold:
+            font = template.font()
+            font.setBold(True)
+            template.setFont(font)
+        return template
+
+    @staticmethod
+    def _create_header(sheet, row, start_col, cols, template):
+        set_item = sheet.setItem
+        for col in range(cols):
+            header_item = template.clone()
+            header_item.setText(f"Header {col + 1}")
+            set_item(row, start_col + col, header_item)
+
+    def _create_simple(self, sheet, start_row, start_col, rows, cols, style_dict):
+        header = self._table_template("", style_dict["header"], QColor("black"), bold=True)
+        self._create_header(sheet, start_row, start_col, cols, header)
+
+        clone = self._table_template("Data", style_dict["cells"]).clone
+        set_item = sheet.setItem
+        for row in range(start_row + 1, start_row + rows):
+            for col in range(start_col, start_col + cols):
+                set_item(row, col, clone())
+
+    def _create_striped(self, sheet, start_row, start_col, rows, cols, style_dict):
+        header = self._table_template("", style_dict["header"], QColor("black"), bold=True)
+        self._create_header(sheet, start_row, start_col, cols, header)
+
+        # Even and odd data rows each get their own loop so no cell picks a brush
+        even_brush, odd_brush = style_dict["cells"]
+        set_item = sheet.setItem
+        end_row = start_row + rows
+        for brush, first_row in ((even_brush, start_row + 1), (odd_brush, start_row + 2)):
+            clone = self._table_template("Data", brush).clone
+            for row in range(first_row, end_row, 2):
+                for col in range(start_col, start_col + cols):
+                    set_item(row, col, clone())
+
+    def _create_professional(self, sheet, start_row, start_col, rows, cols, style_dict):
+        header = self._table_template("", style_dict["header"], QColor("white"), bold=True)
+        self._create_header(sheet, start_row, start_col, cols, header)
+
+        clone = self._table_template("Data", style_dict["cells"]).clone
+        set_item = sheet.setItem
+        for row in range(start_row + 1, start_row + rows):
+            for col in range(start_col, start_col + cols):
+                set_item(row, col, clone())
+
     def sort_table(self):
         current_row = self.current_sheet.currentRow()
         current_col = self.current_sheet.currentColumn()
@@ -505,32 +1350,38 @@ class ExcelClone(QMainWindow):
 
         col_to_sort = current_col - table['start_col']
         
-        # Collect data from the table
-        data = []
-        for row in range(table['rows'] - 1):  # Exclude header row
-            row_data = []
-            for col in range(table['cols']):
-                item = self.current_sheet.item(table['start_row'] + row + 1, 
-                                           table['start_col'] + col)
-                row_data.append(item.text() if item else "")
-            data.append(row_data)
+        sheet = self.current_sheet
+        first_row = table['start_row'] + 1  # Exclude header row
+        first_col = table['start_col']
 
-        # Sort data based on the selected column
-        data.sort(key=lambda x: x[col_to_sort])
+        # Collect data from the table
+        data = np.empty((table['rows'] - 1, table['cols']), dtype=object)
+        for row in range(data.shape[0]):
+            for col in range(data.shape[1]):
+                item = sheet.item(first_row + row, first_col + col)
+                data[row, col] = item.text() if item else ""
+
+        # Sort numerically when the whole column is numeric, otherwise as
+        # case-insensitive text
+        key = sheet.numbers[first_row:first_row + data.shape[0], first_col + col_to_sort]
+        if np.isnan(key).any():
+            key = np.char.lower(data[:, col_to_sort].astype(str))
+        sorted_data = data[np.argsort(key, kind='stable')]
 
         # Update the table with sorted data
-        for row, row_data in enumerate(data):
-            for col, cell_data in enumerate(row_data):
-                item = QTableWidgetItem(cell_data)
-                self.current_sheet.setItem(table['start_row'] + row + 1, 
-                                       table['start_col'] + col, item)
+        with bulk_update(sheet):
+            for row in range(sorted_data.shape[0]):
+                for col in range(sorted_data.shape[1]):
+                    sheet.setItem(first_row + row, first_col + col,
+                                  QTableWidgetItem(sorted_data[row, col]))
+        self._dirty = True
+        self.recalculate(sheet, [(first_row + row, first_col + col)
+                                 for row in range(sorted_data.shape[0])
+                                 for col in range(sorted_data.shape[1])])
 
     def get_sort_key(self, value):
         """Handle different types of data for sorting"""
-        try:
-            return float(value)
-        except ValueError:
-            return str(value).lower()
+        return float(value) if _is_numeric(value) else str(value).lower()
 
     def update_table_data(self, table, data):
         for row, row_data in enumerate(data):
@@ -561,15 +1412,17 @@ class ExcelClone(QMainWindow):
         dialog = DataValidationDialog(self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             validation_type = dialog.type_combo.currentText()
+            sheet = self.current_sheet
             
-            for item in self.spreadsheet.selectedItems():
+            for item in sheet.selectedItems():
                 cell_id = self.get_cell_id(item.row(), item.column())
                 validation = {
                     'type': validation_type,
                     'min': dialog.min_value.text() if validation_type == "Custom Range" else None,
                     'max': dialog.max_value.text() if validation_type == "Custom Range" else None
                 }
-                self.cell_validations[cell_id] = validation
+                sheet.cell_validations[cell_id] = validation
+            self._dirty = True
 
     def validate_cell_input(self, item):
         """Validate cell input based on sheet-specific validation rules"""
@@ -588,28 +1441,18 @@ class ExcelClone(QMainWindow):
             return True
 
         validation = sheet.cell_validations[cell_id]
-        value = item.text()
+        value = _try_float(item.text())
 
         if validation['type'] == "Number Only":
-            try:
-                float(value)
-                return True
-            except ValueError:
-                return False
+            return value is not None
         elif validation['type'] == "Text Only":
-            try:
-                float(value)
-                return False
-            except ValueError:
-                return True
+            return value is None
         elif validation['type'] == "Custom Range":
-            try:
-                num_value = float(value)
-                min_val = float(validation['min']) if validation['min'] else float('-inf')
-                max_val = float(validation['max']) if validation['max'] else float('inf')
-                return min_val <= num_value <= max_val
-            except ValueError:
+            if value is None:
                 return False
+            min_val, max_val = _validation_bounds(validation)
+            return ((min_val is None or min_val <= value) and
+                    (max_val is None or value <= max_val))
 
         return True
 
@@ -629,12 +1472,55 @@ class ExcelClone(QMainWindow):
             return
 
         text = item.text()
+        cell = (item.row(), item.column())
         if text.startswith('='):
-            result = self.evaluate_formula(text)
-            # Temporarily disconnect to prevent recursive signal
-            sheet.itemChanged.disconnect(self.cell_changed)
-            item.setText(result)
-            sheet.itemChanged.connect(self.cell_changed)
+            sheet.set_formula(cell, text, *_formula_precedents(text[1:]))
+        else:
+            sheet.clear_formula(cell)
+        self.recalculate(sheet, cell)
+
+    def recalculate(self, sheet, cells):
+        """Re-evaluate the formulas depending on one or more cells, each once, in dependency order"""
+        levels, cyclic = sheet.recalc_order(cells)
+        if not levels and not cyclic:
+            return
+
+        cache = sheet.value_cache
+        # Temporarily disconnect to prevent recursive signal
+        with suspend_cell_signals(sheet, self.cell_changed):
+            for level in levels:
+                # Range functions within a level don't depend on each other,
+                # so large groups of them are reduced in one kernel call
+                results = {}
+                ranges = [c for c in level if _range_formula(sheet.formulas[c])]
+                if len(ranges) >= RANGE_BATCH_MIN:
+                    kernel = _range_kernel()
+                    if kernel is not None:
+                        results = self.evaluate_range_batch(sheet, ranges, kernel)
+
+                for current in level:
+                    result = results.get(current)
+                    if result is None:
+                        result = self.evaluate_formula(sheet.formulas[current])
+                    value = _try_float(result)
+                    cache[current] = result if value is None else value
+                    sheet.item(*current).setText(result)
+
+            for current in cyclic:
+                cache[current] = "#CIRCULAR"
+                sheet.item(*current).setText("#CIRCULAR")
+
+    def evaluate_range_batch(self, sheet, cells, kernel):
+        """Evaluate range-function formulas with a single call of the compiled kernel"""
+        specs = np.array([_range_formula(sheet.formulas[c]) for c in cells], dtype=np.int64)
+        # The kernel doesn't bounds check, so clip every range to the used range
+        np.minimum(specs[:, 3], sheet.used_max_row, out=specs[:, 3])
+        np.minimum(specs[:, 4], sheet.used_max_col, out=specs[:, 4])
+        out = np.empty(len(cells))
+        kernel(sheet.numbers, specs[:, 0], specs[:, 1], specs[:, 2], specs[:, 3], specs[:, 4], out)
+
+        return {cell: _range_result(opcode, value)
+                for cell, opcode, value in zip(cells, specs[:, 0].tolist(), out.tolist())}
 
     def new_file(self):
         """Create a new spreadsheet, prompting to save if there are unsaved changes"""
@@ -653,29 +1539,28 @@ class ExcelClone(QMainWindow):
             elif reply == QMessageBox.StandardButton.Cancel:
                 return  # Don't create new file if user cancels
 
-        # Disconnect the itemChanged signal temporarily to prevent triggering while clearing
-        self.spreadsheet.itemChanged.disconnect(self.cell_changed)
-        
-        # Clear all content
-        self.spreadsheet.clear()
-        
-        # Reset the spreadsheet
-        self.setup_spreadsheet()
-        
-        # Clear the tables list
-        self.tables.clear()
-        
-        # Clear the clipboard
+        # Start over with a single empty sheet, like a freshly opened window
+        while self.tab_widget.count() > 0:
+            self.tab_widget.removeTab(0)
+        self._sheet_names.clear()
+
+        new_sheet = Sheet()
+        new_sheet.itemChanged.connect(self.cell_changed)
+        new_sheet.itemChanged.connect(self._on_item_changed)
+        self.tab_widget.addTab(new_sheet, 'Sheet1')
+        self._sheet_names.add('Sheet1')
+
+        # Clear the clipboard and the formula bar
         self.clipboard = None
-        
-        # Clear the formula bar
         self.formula_bar.clear()
-        
-        # Clear validations
-        self.cell_validations.clear()
-        
-        # Reconnect the itemChanged signal
-        self.spreadsheet.itemChanged.connect(self.cell_changed)
+
+        # Drop formulas compiled for the previous workbook
+        _compile_formula.cache_clear()
+        _hot_formulas.clear()
+
+        # The new workbook isn't saved anywhere yet, so Save must ask for a file
+        self.current_file_path = None
+        self._dirty = False
 
     def save_file(self):
         if hasattr(self, 'current_file_path') and self.current_file_path:
@@ -691,48 +1576,91 @@ class ExcelClone(QMainWindow):
         
         if filename:
             try:
-                data = {
-                    'sheets': {}
-                }
-                
-                # Save each sheet
-                for sheet_index in range(self.tab_widget.count()):
-                    sheet = self.tab_widget.widget(sheet_index)
-                    sheet_name = self.tab_widget.tabText(sheet_index)
-                    sheet_data = {
-                        'cells': {},
-                        'tables': getattr(sheet, 'tables', []),
-                        'validations': getattr(sheet, 'cell_validations', {})
-                    }
-                    
-                    # Save cell contents and formatting
-                    for row in range(sheet.rowCount()):
-                        for col in range(sheet.columnCount()):
-                            item = sheet.item(row, col)
-                            if item and (item.text() or item.background().color().isValid()):
-                                cell_id = self.get_cell_id(row, col)
-                                sheet_data['cells'][cell_id] = {
-                                    'text': item.text(),
-                                    'background': item.background().color().name(),
-                                    'foreground': item.foreground().color().name(),  # Add foreground color
-                                    'font_family': item.font().family(),
-                                    'font_size': item.font().pointSize(),
-                                    'font_bold': item.font().bold(),
-                                    'font_italic': item.font().italic()
-                                }
-                
-                data['sheets'][sheet_name] = sheet_data
-            
-                with open(filename, 'w') as f:
-                    json.dump(data, f)
+                # Stream one sheet at a time instead of building the whole
+                # workbook in memory first. Write to a temporary file next to
+                # the target and swap it in only once it is complete, so a
+                # failure part way through never truncates the existing file
+                temp_filename = filename + '.tmp'
+                with open(temp_filename, 'wb') as f:
+                    f.write(b'{"sheets":{')
+                    for sheet_index in range(self.tab_widget.count()):
+                        if sheet_index:
+                            f.write(b',')
+                        f.write(_json_dumps(self.tab_widget.tabText(sheet_index)))
+                        f.write(b':')
+                        f.write(_json_dumps(self.get_sheet_data(self.tab_widget.widget(sheet_index))))
+                    f.write(b'}}')
+                os.replace(temp_filename, filename)
                     
                 self.current_file_path = filename  # Store the file path
+                self._dirty = False
                 logging.info(f"File saved successfully: {filename}")
                 
             except Exception as e:
+                with contextlib.suppress(OSError):
+                    os.remove(temp_filename)
                 logging.error(f"Error saving file: {str(e)}")
                 QMessageBox.warning(self, "Error", f"Could not save file: {str(e)}")
 
+    def get_sheet_data(self, sheet):
+        """Collect a sheet's cells, tables and validations for saving"""
+        # Save non-empty cells column-wise, one list per field. Colors and
+        # fonts are stored once per sheet and the cells refer to them by index
+        columns = {'row': [], 'col': [], 'text': [], 'background': [], 'foreground': [], 'font': []}
+        colors = {}  # "#rrggbb" -> index
+        fonts = {}  # (family, size, flags) -> index
+
+        rows, cols, texts = columns['row'], columns['col'], columns['text']
+        backgrounds, foregrounds, font_ids = columns['background'], columns['foreground'], columns['font']
+        for row, col in sheet.populated_cells():
+            item = sheet.item(row, col)
+            if item and (item.text() or item.background().color().isValid()):
+                font = item.font()
+                flags = (FONT_BOLD if font.bold() else 0) | (FONT_ITALIC if font.italic() else 0)
+                rows.append(int(row))
+                cols.append(int(col))
+                texts.append(item.text())
+                backgrounds.append(colors.setdefault(_color_hex(item.background().color()), len(colors)))
+                foregrounds.append(colors.setdefault(_color_hex(item.foreground().color()), len(colors)))
+                font_ids.append(fonts.setdefault((font.family(), font.pointSize(), flags), len(fonts)))
+
+        return {
+            'columns': columns,
+            'colors': list(colors),
+            'fonts': [list(key) for key in fonts],
+            'tables': getattr(sheet, 'tables', []),
+            'validations': getattr(sheet, 'cell_validations', {})
+        }
+
+    @staticmethod
+    def read_sheet_cells(sheet_data, get_color, get_font):
+        """Yield (row, col, text, background, foreground, font) for each saved cell"""
+        columns = sheet_data.get('columns')
+        if columns is not None:
+            colors = [get_color(name) for name in sheet_data['colors']]
+            fonts = [get_font(*key) for key in sheet_data['fonts']]
+            for row, col, text, background, foreground, font in zip(
+                    columns['row'], columns['col'], columns['text'],
+                    columns['background'], columns['foreground'], columns['font']):
+                yield row, col, text, colors[background], colors[foreground], fonts[font]
+            return
+
+        # Files saved before cells were stored column-wise, keyed by cell id
+        for cell_id, cell_data in sheet_data['cells'].items():
+            row, col = _parse_ref(cell_id)
+            if isinstance(cell_data, dict):
+                # Files saved before cells were packed into lists
+                text = cell_data['text']
+                background = cell_data['background']
+                foreground = cell_data.get('foreground', 'black')
+                family = cell_data['font_family']
+                size = cell_data['font_size']
+                flags = ((FONT_BOLD if cell_data['font_bold'] else 0) |
+                         (FONT_ITALIC if cell_data['font_italic'] else 0))
+            else:
+                text, background, foreground, family, size, flags = cell_data
+            yield row, col, text, get_color(background), get_color(foreground), get_font(family, size, flags)
+
     def open_file(self):
         filename, _ = QFileDialog.getOpenFileName(
             self, "Open Spreadsheet", "", 
@@ -741,58 +1669,82 @@ class ExcelClone(QMainWindow):
         
         if filename:
             try:
-                with open(filename, 'r') as f:
-                    data = json.load(f)
+                with open(filename, 'rb') as f:
+                    data = _json_loads(f.read())
                 
+                self._loading = True
                 # Clear current sheets
                 while self.tab_widget.count() > 0:
                     self.tab_widget.removeTab(0)
+                self._sheet_names.clear()
                 
+                # Fonts and colors are shared across the whole file so each
+                # distinct one is only constructed once
+                fonts = {}
+                colors = {}
+
+                def get_color(name):
+                    color = colors.get(name)
+                    if color is None:
+                        color = colors[name] = QColor(name)
+                    return color
+
+                def get_font(family, size, flags):
+                    font = fonts.get((family, size, flags))
+                    if font is None:
+                        font = fonts[(family, size, flags)] = QFont(family, size)
+                        font.setBold(bool(flags & FONT_BOLD))
+                        font.setItalic(bool(flags & FONT_ITALIC))
+                    return font
+
                 # Load sheets
                 for sheet_name, sheet_data in data['sheets'].items():
-                    new_sheet = Sheet()
+                    cells = list(self.read_sheet_cells(sheet_data, get_color, get_font))
+                    
+                    # Size the sheet once to fit every saved cell, rather than
+                    # dropping cells outside the default grid
+                    rows = max((cell[0] for cell in cells), default=-1) + 1
+                    cols = max((cell[1] for cell in cells), default=-1) + 1
+                    new_sheet = Sheet(max(rows, 50), max(cols, 26))
                     new_sheet.itemChanged.connect(self.cell_changed)
+                    new_sheet.itemChanged.connect(self._on_item_changed)
                     
                     # Restore cells
-                    for cell_id, cell_data in sheet_data['cells'].items():
-                        col = ord(cell_id[0]) - 65
-                        row = int(cell_id[1:]) - 1
-                        
-                        item = QTableWidgetItem(cell_data['text'])
-                        
-                        # Restore formatting
-                        font = QFont(cell_data['font_family'], 
-                                   cell_data['font_size'])
-                        font.setBold(cell_data['font_bold'])
-                        font.setItalic(cell_data['font_italic'])
-                        item.setFont(font)
-                        
-                        # Set background color
-                        item.setBackground(QColor(cell_data['background']))
-                        
-                        # Set text color (foreground)
-                        if 'foreground' in cell_data:
-                            item.setForeground(QColor(cell_data['foreground']))
-                        else:
-                            item.setForeground(QColor("black"))  # Default text color
-                        
-                        new_sheet.setItem(row, col, item)
+                    with bulk_update(new_sheet):
+                        for row, col, text, background, foreground, font in cells:
+                            item = QTableWidgetItem(text)
+                            
+                            # Restore formatting
+                            item.setFont(font)
+                            item.setBackground(background)
+                            item.setForeground(foreground)
+                            
+                            new_sheet.setItem(row, col, item)
                     
                     # Restore tables and validations
                     new_sheet.tables = sheet_data.get('tables', [])
-                    new_sheet.cell_validations = sheet_data.get('validations', {})
+                    # Older saves also stored parsed bounds as _min/_max
+                    new_sheet.cell_validations = {
+                        cell_id: {key: value for key, value in validation.items()
+                                  if not key.startswith('_')}
+                        for cell_id, validation in sheet_data.get('validations', {}).items()
+                    }
                     
                     self.tab_widget.addTab(new_sheet, sheet_name)
+                    self._sheet_names.add(sheet_name)
                 
                 # Select first sheet
                 if self.tab_widget.count() > 0:
                     self.tab_widget.setCurrentIndex(0)
                 
                 self.current_file_path = filename  # Store the opened file path
+                self._dirty = False
                 
             except Exception as e:
                 logging.error(f"Error opening file: {str(e)}")
                 QMessageBox.warning(self, "Error", f"Could not open file: {str(e)}")
+            finally:
+                self._loading = False
 
     def evaluate_formula(self, formula):
         if not formula.startswith('='):
@@ -801,124 +1753,121 @@ class ExcelClone(QMainWindow):
         formula = formula[1:]  # Remove equals sign
         
         # Handle special functions
-        if formula.startswith(('SUM(', 'AVERAGE(', 'MIN(', 'MAX(', 'COUNT(')):
-            return self.handle_special_function(formula)
+        function_match = _FUNC_RE.fullmatch(formula)
+        if function_match and function_match.group(1) in RANGE_FUNCTIONS:
+            return self.handle_special_function(*function_match.groups())
             
-        # Replace cell references with values
-        formula = self.replace_cell_references(formula)
-        if formula.startswith('ERROR'):
-            return formula
-        
-        # Safely evaluate the formula
+        # Parse once per unique formula, then feed in the referenced values
+        try:
+            compiled = _compile_formula(formula)
+        except ZeroDivisionError:
+            return DIVISION_ERROR
+        except Exception as e:
+            return f"ERROR: Invalid formula ({str(e)})"
+        if compiled is None:
+            return "ERROR: Invalid characters in formula"
+
+        rpn, refs = compiled
+        if not refs:
+            return str(rpn)
+
+        # Formula results come from the sheet's cache, other cells from the
+        # numeric shadow, which holds each cell's text already parsed
+        sheet = self.current_sheet
+        cache = sheet.value_cache
+        numbers = sheet.numbers
+        values = []
+        for cell_ref in refs:
+            try:
+                row, col = cell = self.parse_cell_id(cell_ref)
+            except ValueError:
+                return "ERROR: Invalid cell reference"
+            cell_value = cache.get(cell)
+            if cell_value is None:
+                in_sheet = 0 <= row < numbers.shape[0] and col < numbers.shape[1]
+                cell_value = numbers.item(row, col) if in_sheet else math.nan
+            if isinstance(cell_value, str) or math.isnan(cell_value):
+                return "ERROR: Invalid cell reference"
+            values.append(cell_value)
+
         try:
-            # Only allow safe operations
-            allowed_chars = set('0123456789+-*/() .')
-            if not all(c in allowed_chars for c in formula):
-                return "ERROR: Invalid characters in formula"
-            result = eval(formula)
+            func = _formula_callable(rpn, len(refs))
+            result = func(*values) if func else _eval_rpn(rpn, values)
             return str(result)
+        except ZeroDivisionError:
+            return DIVISION_ERROR
         except Exception as e:
             return f"ERROR: Invalid formula ({str(e)})"
 
-    def handle_special_function(self, formula):
-        function_match = re.match(r'([A-Z]+)\((.*)\)', formula)
-        if not function_match:
-            return "ERROR: Invalid function format"
-            
-        func_name, range_str = function_match.groups()
+    def handle_special_function(self, func_name, range_str):
+        reducer = RANGE_FUNCTIONS[func_name]
+
         try:
-            cells = self.get_cells_in_range(range_str)
-            values = [float(cell.text() or 0) for cell in cells]
-            
-            if not values:
-                return "0"
-                
-            if func_name == "SUM":
-                return str(sum(values))
-            elif func_name == "AVERAGE":
-                return str(sum(values) / len(values))
-            elif func_name == "MIN":
-                return str(min(values))
-            elif func_name == "MAX":
-                return str(max(values))
-            elif func_name == "COUNT":
-                return str(len([v for v in values if v != 0]))
+            values = self.get_range_values(range_str)
+            if func_name in ('AVERAGE', 'MIN', 'MAX') and np.isnan(values).all():
+                # No numbers in range: MIN and MAX give 0, AVERAGE has nothing to divide
+                if func_name == 'AVERAGE':
+                    return "ERROR: Invalid AVERAGE range"
+                return "0.0"
+            return str(reducer(values))
                 
         except Exception as e:
             logging.error(f"Function evaluation error: {str(e)}")
             return f"ERROR: Invalid {func_name} range"
 
-    def get_cells_in_range(self, range_str):
-        start, end = range_str.split(':')
-        start_item = self.get_cell_from_id(start)
-        end_item = self.get_cell_from_id(end)
-        
-        start_row = start_item.row()
-        start_col = start_item.column()
-        end_row = end_item.row()
-        end_col = end_item.column()
-        
-        cells = []
-        for row in range(min(start_row, end_row), max(start_row, end_row) + 1):
-            for col in range(min(start_col, end_col), max(start_col, end_col) + 1):
-                item = self.spreadsheet.item(row, col)
-                if item is None:
-                    item = QTableWidgetItem("0")
-                    self.spreadsheet.setItem(row, col, item)
-                cells.append(item)
-        return cells
+    def get_range_values(self, range_str):
+        """Return a cell range as a view of the sheet's numeric shadow.
+
+        The range is clipped to the sheet's used range, past which every
+        cell is blank. Ranges larger than the number of populated cells are
+        gathered sparsely, from the cells holding items only.
+        """
+        match = _RANGE_RE.fullmatch(range_str)
+        if not match:
+            raise ValueError(f"Invalid range: {range_str}")
+        start_col, start_row, end_col, end_row = match.groups()
+        start_row, end_row = int(start_row) - 1, int(end_row) - 1
+        if min(start_row, end_row) < 0:
+            raise ValueError(f"Invalid range: {range_str}")
+        start_col, end_col = _col_to_index(start_col), _col_to_index(end_col)
+
+        top, bottom = min(start_row, end_row), max(start_row, end_row)
+        left, right = min(start_col, end_col), max(start_col, end_col)
+
+        sheet = self.current_sheet
+        bottom = min(bottom, sheet.used_max_row)
+        right = min(right, sheet.used_max_col)
+        if (bottom - top + 1) * (right - left + 1) <= sheet.populated_count():
+            return sheet.numbers[top:bottom + 1, left:right + 1]
+
+        # The range is mostly empty, so only gather the cells holding items
+        cells = list(sheet.populated_in_range(top, left, bottom, right))
+        if not cells:
+            return np.empty(0)
+        rows, cols = zip(*cells)
+        return sheet.numbers[rows, cols]
 
     def formula_entered(self):
-        current_item = self.spreadsheet.currentItem()
+        current_item = self.current_sheet.currentItem()
         if current_item:
             current_item.setText(self.formula_bar.text())
 
     def update_formula_bar(self, current, previous):
         if current:
-            self.formula_bar.setText(current.text())
+            # Show a formula cell's formula rather than its result
+            cell = (current.row(), current.column())
+            self.formula_bar.setText(current.tableWidget().formulas.get(cell, current.text()))
 
     def get_cell_id(self, row, col):
-        return f"{chr(65 + col)}{row + 1}"
-
-    def get_cell_from_id(self, cell_id):
-        match = re.match(r"([A-Z])(\d+)", cell_id)
-        if match:
-            col = ord(match.group(1)) - 65
-            row = int(match.group(2)) - 1
-            item = self.spreadsheet.item(row, col)
-            if item is None:
-                item = QTableWidgetItem("")
-                self.spreadsheet.setItem(row, col, item)
-            return item
-        return None
+        return _cell_id(row, col)
 
-    def replace_cell_references(self, formula):
-        """Replace cell references with their values"""
-        cell_pattern = r'[A-Z]\d+'
-        cell_references = re.findall(cell_pattern, formula)
-        
-        for cell_ref in cell_references:
-            cell_item = self.get_cell_from_id(cell_ref)
-            cell_value = cell_item.text() if cell_item else "0"
-            try:
-                cell_value = float(cell_value)
-            except ValueError:
-                return "ERROR: Invalid cell reference"
-            formula = formula.replace(cell_ref, str(cell_value))
-        
-        return formula
+    def parse_cell_id(self, cell_id):
+        """Convert a cell id like B3 into a (row, col) tuple"""
+        return _parse_ref(cell_id)
 
     def has_unsaved_changes(self):
         """Check if there are any unsaved changes in any sheet"""
-        for sheet_index in range(self.tab_widget.count()):
-            sheet = self.tab_widget.widget(sheet_index)
-            # Check if any cell in the sheet has content
-            for row in range(sheet.rowCount()):
-                for col in range(sheet.columnCount()):
-                    item = sheet.item(row, col)
-                    if item and item.text():
-                        return True
-        return False
+        return self._dirty
 
     def closeEvent(self, event):
         """Handle the window close event"""
@@ -943,11 +1892,33 @@ class ExcelClone(QMainWindow):
         else:
             event.ignore()
 
-    def check_updates(self):
-        checker = UpdateChecker()
-        update_available, latest_version, download_url, changelog = checker.check_for_updates()
+    def check_updates(self, force=False):
+        # Check on a worker thread so a slow network never blocks the window
+        if self._update_thread is not None:
+            return
         
+        thread = self._update_thread = QThread()
+        worker = self._update_worker = _UpdateWorker(force)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self.show_update)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(self.update_check_finished)
+        thread.start()
+
+    def update_check_finished(self):
+        self._update_thread = None
+        self._update_worker = None
+
+    def wait_for_update_check(self):
+        """Let a running update check finish before the app exits"""
+        if self._update_thread is not None:
+            self._update_thread.quit()
+            self._update_thread.wait()
+
+    def show_update(self, update_available, latest_version, download_url, changelog):
         if update_available:
+            checker = self._update_worker.checker
             msg = QMessageBox()
             msg.setWindowTitle("Update Available")
             msg.setWindowIcon(self.windowIcon())
@@ -966,6 +1937,7 @@ class ExcelClone(QMainWindow):
             )
             
             if msg.exec() == QMessageBox.StandardButton.Yes:
+                import webbrowser
                 webbrowser.open(download_url)
 
     def save_as_file(self):
@@ -1014,22 +1986,25 @@ class DataValidationDialog(QDialog):
         self.range_widget.setVisible(text == "Custom Range")
 
 class UpdateChecker:
+    CACHE_TTL = 24 * 60 * 60  # Seconds between automatic update checks
+
     def __init__(self):
         self.current_version = "1.0.0"  # Your current version
         self.update_url = "https://raw.githubusercontent.com/YourUsername/ArielSheets/main/version.json"
         # Backup URL in case GitHub is down
         self.backup_url = "https://your-backup-domain.com/version.json"
+        self.cache_path = os.path.join(app_data_path, 'update_cache.json')
+
+    def check_for_updates(self, force=False):
+        from packaging import version
 
-    def check_for_updates(self):
         try:
-            # Try primary URL
-            response = requests.get(self.update_url, timeout=5)
-            if response.status_code != 200:
-                # Try backup URL if primary fails
-                response = requests.get(self.backup_url, timeout=5)
+            # Only go to the network when the cached result is stale
+            update_data = None if force else self.load_cached_update()
+            if update_data is None:
+                update_data = self.fetch_update_data()
             
-            if response.status_code == 200:
-                update_data = response.json()
+            if update_data is not None:
                 latest_version = update_data.get('version')
                 download_url = update_data.get('download_url')
                 changelog = update_data.get('changelog', '')
@@ -1043,19 +2018,59 @@ class UpdateChecker:
             logging.error(f"Update check failed: {str(e)}")
             return False, None, None, None
 
-class Style:
-    # Color scheme
-    PRIMARY = "#2E7D32"  # Dark green
-    SECONDARY = "#4CAF50"  # Medium green
-    ACCENT = "#81C784"  # Light green
-    BACKGROUND = "#FFFFFF"  # White
-    SURFACE = "#F5F5F5"  # Light gray
-    TEXT = "#212121"  # Almost black
-    TEXT_SECONDARY = "#757575"  # Gray
-    
-    @staticmethod
-    def get_stylesheet():
-        return """
+    def load_cached_update(self):
+        """Return the cached version info if it was fetched within CACHE_TTL"""
+        try:
+            with open(self.cache_path, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if time.time() - cache.get('last_check', 0) >= self.CACHE_TTL:
+            return None
+        return cache
+
+    def fetch_update_data(self):
+        """Download the version info and cache it, or return None on failure"""
+        import requests
+
+        with requests.Session() as session:
+            session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            
+            # Try primary URL
+            response = session.get(self.update_url, timeout=3)
+            if response.status_code != 200:
+                # Try backup URL if primary fails
+                response = session.get(self.backup_url, timeout=3)
+        
+        if response.status_code != 200:
+            return None
+        
+        update_data = response.json()
+        cache = {
+            'last_check': time.time(),
+            'version': update_data.get('version'),
+            'download_url': update_data.get('download_url'),
+            'changelog': update_data.get('changelog', '')
+        }
+        with open(self.cache_path, 'w') as f:
+            json.dump(cache, f)
+        return cache
+
+class _UpdateWorker(QObject):
+    """Runs an UpdateChecker off the GUI thread"""
+    finished = pyqtSignal(bool, object, object, object)
+
+    def __init__(self, force=False):
+        super().__init__()
+        self.checker = UpdateChecker()
+        self.force = force
+
+    def run(self):
+        self.finished.emit(*self.checker.check_for_updates(self.force))
+
+# Application stylesheet, built once and applied when the window is created
+STYLESHEET = """
         QMainWindow {
             background-color: #F5F5F5;
         }
@@ -1173,6 +2188,20 @@ class Style:
         }
         """
 
+class Style:
+    # Color scheme
+    PRIMARY = "#2E7D32"  # Dark green
+    SECONDARY = "#4CAF50"  # Medium green
+    ACCENT = "#81C784"  # Light green
+    BACKGROUND = "#FFFFFF"  # White
+    SURFACE = "#F5F5F5"  # Light gray
+    TEXT = "#212121"  # Almost black
+    TEXT_SECONDARY = "#757575"  # Gray
+    
+    @staticmethod
+    def get_stylesheet():
+        return STYLESHEET
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     